@@ -3,11 +3,40 @@ Internal maintainer helper for exporting repository source into one text file.
 """
 
 import argparse
+import codecs
+import io
 import json
 import logging
 import os
+import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import ijson
+except ImportError:  # Optional: only used to stream large notebooks.
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # Optional: faster parser for whole notebooks.
+    orjson = None
 
 # --- CONFIGURATION ---
 def _find_project_root(start: Path) -> Path:
@@ -27,10 +56,38 @@ except NameError:
 
 OUTPUT_FILENAME = "full_project_source.txt"
 
+# Write buffer for the combined output; the 8 KiB io default means one
+# write() syscall every few source files.
+OUTPUT_BUFFER_SIZE = 1 << 18
+
+# Leading bytes inspected for NUL characters when deciding text vs binary.
+SNIFF_SIZE = 4096
+
+# Chunk size used when streaming text files into the combined output.
+READ_CHUNK_SIZE = 1 << 16
+
+# Notebooks larger than this are parsed incrementally with ijson, so bulky cell
+# outputs are never materialized. This trades speed for memory: even the yajl C
+# backend is about 2x slower than json.loads, and the pure-Python backend about
+# 20x, so streaming is only enabled when a yajl backend is available. When
+# orjson is installed speed wins instead: it parses whole notebooks about 4x
+# faster than yajl streams them, so large notebooks go through orjson too.
+NOTEBOOK_STREAM_THRESHOLD = 256 * 1024
+_STREAM_NOTEBOOKS = (
+    orjson is None
+    and ijson is not None
+    and ijson.backend in ("yajl2_c", "yajl2_cffi")
+)
+
+# Reader threads for file ingestion (I/O bound, so oversubscribe the CPUs) and
+# the number of files allowed in flight ahead of the ordered writer.
+MAX_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+MAX_PENDING_FILES = MAX_READ_WORKERS * 4
+
 # --- EXCLUSION LISTS ---
 
 # Directories to exclude if they appear ANYWHERE in the project structure.
-EXCLUDE_DIRS_ANYWHERE: Set[str] = {
+EXCLUDE_DIRS_ANYWHERE: FrozenSet[str] = frozenset({
     ".git",
     "__pycache__",
     ".pytest_cache",
@@ -45,11 +102,11 @@ EXCLUDE_DIRS_ANYWHERE: Set[str] = {
     "dist",
     "renv",
     "node_modules",
-}
+})
 
 # Directories to exclude ONLY if they are in the project root directory.
 # This allows keeping nested directories with the same name (e.g., 'src/app/data').
-EXCLUDE_DIRS_ROOT_ONLY: Set[str] = {
+EXCLUDE_DIRS_ROOT_ONLY: FrozenSet[str] = frozenset({
     "data",  # User-specific data, not source code
 #     "tests",
     ".ruff_cache",
@@ -63,13 +120,28 @@ EXCLUDE_DIRS_ROOT_ONLY: Set[str] = {
     "configs",
     ".github",
     ".githooks",
-}
+})
 
 # Directory name patterns to exclude (e.g., any directory ending with .egg-info).
 EXCLUDE_DIR_PATTERNS: tuple[str, ...] = (".egg-info",)
 
+# All directory suffix patterns compiled once into a single end-anchored regex.
+_EXCLUDE_DIR_PATTERN_RE = re.compile(
+    "(?:" + ("|".join(map(re.escape, EXCLUDE_DIR_PATTERNS)) or "(?!)") + r")\Z"
+)
+
+# The name-based directory rules folded into one lookup table per location, so
+# classifying a directory is a single dict probe plus the suffix regex.
+_NESTED_DIR_EXCLUDE_REASONS: Dict[str, str] = dict.fromkeys(
+    EXCLUDE_DIRS_ANYWHERE, "excluded directory (anywhere)"
+)
+_ROOT_DIR_EXCLUDE_REASONS: Dict[str, str] = {
+    **dict.fromkeys(EXCLUDE_DIRS_ROOT_ONLY, "excluded root-only directory"),
+    **_NESTED_DIR_EXCLUDE_REASONS,
+}
+
 # File extensions to exclude, typically for binary or non-source files.
-EXCLUDE_EXTENSIONS: Set[str] = {
+EXCLUDE_EXTENSIONS: FrozenSet[str] = frozenset({
     ".pyc",
     ".pyo",
     ".so",
@@ -97,11 +169,38 @@ EXCLUDE_EXTENSIONS: Set[str] = {
     ".xlsx",
     ".swp",
     ".swo",
-}
+})
+
+# Source/text extensions accepted without sniffing the file for NUL bytes.
+TEXT_EXTENSIONS: FrozenSet[str] = frozenset({
+    ".py",
+    ".md",
+    ".txt",
+    ".rst",
+    ".toml",
+    ".yaml",
+    ".yml",
+    ".json",
+    ".cfg",
+    ".ini",
+    ".html",
+    ".css",
+    ".js",
+    ".ts",
+    ".sh",
+    ".sql",
+    ".r",
+    ".c",
+    ".h",
+    ".cpp",
+    ".java",
+    ".go",
+    ".rs",
+})
 
 # Specific filenames to exclude. The chosen output file will be added at runtime
 # to ensure it is not reprocessed on subsequent runs.
-EXCLUDE_FILES: Set[str] = {
+EXCLUDE_FILES: FrozenSet[str] = frozenset({
     OUTPUT_FILENAME,
     ".DS_Store",
     "Thumbs.db",
@@ -109,12 +208,57 @@ EXCLUDE_FILES: Set[str] = {
     ".env",
     "uv.lock",
     ".gitignore",
-}
+})
+
+
+def _lower_suffix(filename: str) -> str:
+    """Returns the lower-cased extension of ``filename``, matching ``Path.suffix``."""
+    stem, dot, ext = filename.rpartition(".")
+    return f".{ext.lower()}" if dot and stem and ext else ""
 
 
 def is_config_metadata_text_file(filepath: Path) -> bool:
     """Returns True for tracked config metadata that should ship with source."""
-    return filepath.suffix.lower() == ".csv" and "configs" in filepath.parts
+    return _lower_suffix(filepath.name) == ".csv" and "configs" in filepath.parts
+
+
+_JSON_SCALAR_EVENTS = frozenset({"string", "number", "boolean", "null"})
+
+
+def _iter_notebook_cells_streaming(f: Any) -> Iterator[Tuple[Any, Any]]:
+    """Yields ``(cell_type, source)`` per cell from a binary notebook stream.
+
+    Only the ``cell_type`` and ``source`` events are kept; outputs, metadata
+    and execution counts are skipped by the parser without building objects.
+    """
+    cell_type: Any = None
+    source: Any = []
+    for prefix, event, value in ijson.parse(f):
+        if prefix == "cells.item":
+            if event == "start_map":
+                cell_type, source = None, []
+            elif event == "end_map":
+                yield cell_type, source
+        elif prefix == "cells.item.cell_type":
+            cell_type = value
+        elif prefix == "cells.item.source.item":
+            source.append(value)
+        elif prefix == "cells.item.source" and event in _JSON_SCALAR_EVENTS:
+            source = value
+
+
+def _load_notebook_json(data: bytes) -> Any:
+    """Parses notebook JSON with orjson when installed, else the stdlib parser.
+
+    The stdlib path also covers what orjson rejects but ``json`` accepts:
+    invalid UTF-8 (decoded with replacement) and NaN/Infinity literals.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data.decode("utf-8", errors="replace"))
 
 
 def process_notebook(filepath: Path) -> Optional[str]:
@@ -123,81 +267,176 @@ def process_notebook(filepath: Path) -> Optional[str]:
     markdown content while ignoring all cell outputs.
     """
     try:
-        with open(filepath, "r", encoding="utf-8", errors="replace") as f:
-            notebook = json.load(f)
-
-        content_parts: List[str] = []
-        for i, cell in enumerate(notebook.get("cells", [])):
-            cell_type = cell.get("cell_type")
-            source_list = cell.get("source", [])
-
-            # Ensure 'source' is a single string
-            source = (
-                "".join(source_list)
-                if isinstance(source_list, list)
-                else str(source_list)
-            )
-
-            if not source.strip():
-                continue
-
+        with open(filepath, "rb") as f:
+            # fstat on the open descriptor instead of a separate path stat.
+            size = os.fstat(f.fileno()).st_size
+            cells: Optional[List[Tuple[Any, Any]]] = None
+            if _STREAM_NOTEBOOKS and size > NOTEBOOK_STREAM_THRESHOLD:
+                try:
+                    cells = list(_iter_notebook_cells_streaming(f))
+                except ijson.JSONError:
+                    # yajl rejects NaN/Infinity literals and invalid UTF-8,
+                    # both of which the full parse below accepts.
+                    f.seek(0)
+            if cells is None:
+                notebook = _load_notebook_json(f.read())
+                cells = [
+                    (cell.get("cell_type"), cell.get("source", []))
+                    for cell in notebook.get("cells", [])
+                ]
+
+        # Assemble straight into one buffer instead of per-cell strings + join.
+        buf = io.StringIO()
+        for i, (cell_type, source) in enumerate(cells):
             if cell_type == "code":
-                content_parts.append(f"# --- Code Cell {i+1} ---\n{source}\n")
+                label = "Code"
             elif cell_type == "markdown":
-                content_parts.append(f"# --- Markdown Cell {i+1} ---\n{source}\n")
+                label = "Markdown"
+            else:
+                continue
+
+            # 'source' is either a list of lines or a single string.
+            if isinstance(source, list):
+                if not any(line.strip() for line in source):
+                    continue
+            else:
+                source = str(source)
+                if not source.strip():
+                    continue
 
-        return "\n".join(content_parts)
+            if buf.tell():
+                buf.write("\n")
+            buf.write(f"# --- {label} Cell {i + 1} ---\n")
+            if isinstance(source, list):
+                buf.writelines(source)
+            else:
+                buf.write(source)
+            buf.write("\n")
+
+        return buf.getvalue()
     except Exception as e:
-        logging.warning("Could not parse notebook %s: %s", filepath.name, e)
+        logger.warning("Could not parse notebook %s: %s", filepath.name, e)
         return None
 
 
+def is_known_text_file(filepath: Path) -> bool:
+    """Returns True for files treated as text from their name alone."""
+    if _lower_suffix(filepath.name) in TEXT_EXTENSIONS:
+        return True
+    return is_config_metadata_text_file(filepath)
+
+
 def is_likely_text_file(filepath: Path) -> bool:
     """
     Checks if a file is likely to be a text file by checking its extension
-    and sniffing the first 1024 bytes for null characters.
+    and, for unknown extensions, sniffing the first SNIFF_SIZE bytes for null
+    characters.
     """
-    if is_config_metadata_text_file(filepath):
+    if is_known_text_file(filepath):
         return True
-    if filepath.suffix.lower() in EXCLUDE_EXTENSIONS:
+    if _lower_suffix(filepath.name) in EXCLUDE_EXTENSIONS:
         return False
     try:
-        with open(filepath, "rb") as f:
-            # If the first 1KB contains a null byte, it's likely a binary file.
-            return b"\0" not in f.read(1024)
-    except (IOError, PermissionError):
+        # A raw fd avoids setting up a buffered reader just for the sniff.
+        fd = os.open(filepath, os.O_RDONLY)
+        try:
+            head = os.read(fd, SNIFF_SIZE)
+        finally:
+            os.close(fd)
+    except OSError:
         return False
+    # If the first 4KB contains a null byte, it's likely a binary file.
+    return b"\0" not in head
 
 
-def get_directory_exclude_reason(
-    dir_name: str,
-    current_path: Path,
-    project_root: Path,
-) -> Optional[str]:
-    """Returns the exclude reason for a directory, or None if it is included."""
-    if dir_name in EXCLUDE_DIRS_ANYWHERE:
-        return "excluded directory (anywhere)"
-    if dir_name in EXCLUDE_DIRS_ROOT_ONLY and current_path == project_root:
-        return "excluded root-only directory"
-    if any(dir_name.endswith(pattern) for pattern in EXCLUDE_DIR_PATTERNS):
+def stream_text_file(
+    filepath: Path,
+    relative_path_str: str,
+    write: Callable[[str], None],
+    check_binary: bool = True,
+) -> Optional[bool]:
+    """
+    Sniffs a file and streams its stripped text between path tags, opening it
+    only once.
+
+    Decoding matches reading in text mode (UTF-8 with replacement, universal
+    newlines). Returns None if the file looks binary or cannot be opened,
+    False if it has no content after stripping, and True once written.
+    """
+    try:
+        infile = open(filepath, "rb")
+    except OSError:
+        return None
+
+    with infile:
+        chunk = infile.read(READ_CHUNK_SIZE)
+        if check_binary and b"\0" in chunk[:SNIFF_SIZE]:
+            return None
+
+        decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            translate=True,
+        )
+        started = False
+        pending = ""
+        while True:
+            text = decoder.decode(chunk, final=not chunk)
+            if not started:
+                text = text.lstrip()
+            if text:
+                # Hold back trailing whitespace until more content follows,
+                # so the result equals ``content.strip()``.
+                body = text.rstrip()
+                if body:
+                    if not started:
+                        write(f"<{relative_path_str}>\n{body}")
+                        started = True
+                    else:
+                        write(f"{pending}{body}")
+                    pending = text[len(body):]
+                else:
+                    pending += text
+            if not chunk:
+                break
+            chunk = infile.read(READ_CHUNK_SIZE)
+
+    if not started:
+        return False
+    write(f"\n</{relative_path_str}>\n\n")
+    return True
+
+
+def get_directory_exclude_reason(dir_name: str, at_root: bool) -> Optional[str]:
+    """Returns the exclude reason for a directory, or None if it is included.
+
+    ``at_root`` tells whether the directory sits directly under the project root.
+    """
+    reasons = _ROOT_DIR_EXCLUDE_REASONS if at_root else _NESTED_DIR_EXCLUDE_REASONS
+    reason = reasons.get(dir_name)
+    if reason is None and _EXCLUDE_DIR_PATTERN_RE.search(dir_name):
         return "excluded directory pattern"
-    return None
+    return reason
 
 
 def get_archive_file_status(
     filepath: Path,
     exclude_files: Set[str],
+    sniff: bool = True,
 ) -> tuple[bool, str]:
-    """Classifies whether a file should be included in the content export."""
+    """Classifies whether a file should be included in the content export.
+
+    With ``sniff=False`` the NUL-byte check is skipped and left to the caller.
+    """
     if filepath.name in exclude_files:
         return False, "explicitly excluded filename"
-    if filepath.suffix.lower() == ".ipynb":
+    suffix = _lower_suffix(filepath.name)
+    if suffix == ".ipynb":
         return True, "notebook"
     if is_config_metadata_text_file(filepath):
         return True, "config metadata text file"
-    if filepath.suffix.lower() in EXCLUDE_EXTENSIONS:
+    if suffix in EXCLUDE_EXTENSIONS:
         return False, "excluded extension"
-    if is_likely_text_file(filepath):
+    if not sniff or is_likely_text_file(filepath):
         return True, "text file"
     return False, "binary or unreadable file"
 
@@ -210,7 +449,7 @@ def filter_walk_directories(
     """Returns the directories that should remain traversable for os.walk."""
     included_dirs: List[str] = []
     for dirname in dirnames:
-        if get_directory_exclude_reason(dirname, current_path, project_root):
+        if get_directory_exclude_reason(dirname, current_path == project_root):
             continue
         included_dirs.append(dirname)
     included_dirs.sort()
@@ -232,12 +471,15 @@ def collect_project_tree_lines(
         "excluded_directories": 0,
     }
 
-    def _walk_tree(current_path: Path, prefix: str) -> List[str]:
+    def _walk_tree(dir_path: str, prefix: str, at_root: bool) -> List[str]:
+        # DirEntry answers is_dir()/is_file() from the directory listing, so
+        # sorting and classifying children costs no extra stat per entry.
         try:
-            children = sorted(
-                current_path.iterdir(),
-                key=lambda path: (path.is_file(), path.name.lower()),
-            )
+            with os.scandir(dir_path) as it:
+                children = sorted(
+                    it,
+                    key=lambda entry: (entry.is_file(), entry.name.lower()),
+                )
         except OSError as exc:
             return [f"{prefix}`-- [exclude] <unreadable> ({exc})"]
 
@@ -248,9 +490,7 @@ def collect_project_tree_lines(
             child_prefix = prefix + ("    " if is_last else "|   ")
 
             if child.is_dir():
-                reason = get_directory_exclude_reason(
-                    child.name, current_path, project_root
-                )
+                reason = get_directory_exclude_reason(child.name, at_root)
                 if reason:
                     stats["excluded_directories"] += 1
                     lines.append(
@@ -260,10 +500,12 @@ def collect_project_tree_lines(
                     continue
 
                 lines.append(f"{prefix}{connector}[include] {child.name}/")
-                lines.extend(_walk_tree(child, child_prefix))
+                lines.extend(_walk_tree(child.path, child_prefix, False))
                 continue
 
-            include_in_archive, reason = get_archive_file_status(child, exclude_files)
+            include_in_archive, reason = get_archive_file_status(
+                Path(child.path), exclude_files
+            )
             if include_in_archive:
                 stats["included_files"] += 1
                 lines.append(f"{prefix}{connector}[include] {child.name}")
@@ -275,7 +517,7 @@ def collect_project_tree_lines(
 
         return lines
 
-    return ["[include] ./", *_walk_tree(project_root, "")], stats
+    return ["[include] ./", *_walk_tree(os.fspath(project_root), "", True)], stats
 
 
 def collect_file_tree(
@@ -303,6 +545,47 @@ def collect_file_tree(
     return files
 
 
+# (include_in_archive, reason, encoded tagged content or b"" when empty)
+ArchiveEntry = Tuple[bool, str, bytes]
+
+
+def render_archive_entry(
+    filepath: Path,
+    relative_path_str: str,
+    exclude_files: Set[str],
+) -> ArchiveEntry:
+    """Classifies one file and renders its tagged archive block as UTF-8 bytes.
+
+    Runs on the reader pool, so it only touches the input file.
+    """
+    include_in_archive, reason = get_archive_file_status(
+        filepath, exclude_files, sniff=False
+    )
+    if not include_in_archive:
+        return False, reason, b""
+
+    # Step 1: Specifically handle Jupyter Notebooks.
+    if _lower_suffix(filepath.name) == ".ipynb":
+        content = (process_notebook(filepath) or "").strip()
+        if not content:
+            return True, reason, b""
+        block = f"<{relative_path_str}>\n{content}\n</{relative_path_str}>\n\n"
+        return True, reason, block.encode("utf-8", errors="replace")
+
+    # Step 2: Sniff and read general text files with one open.
+    parts: List[str] = []
+    written = stream_text_file(
+        filepath,
+        relative_path_str,
+        parts.append,
+        check_binary=not is_config_metadata_text_file(filepath),
+    )
+    # Step 3: The sniff rejected a binary or unreadable file.
+    if written is None:
+        return False, "binary or unreadable file", b""
+    return True, reason, "".join(parts).encode("utf-8", errors="replace")
+
+
 def combine_project_files(  # noqa: C901 - high complexity due to multiple nested checks
     project_root: Path = PROJECT_ROOT,
     output_filename: str = OUTPUT_FILENAME,
@@ -311,131 +594,169 @@ def combine_project_files(  # noqa: C901 - high complexity due to multiple neste
     and combines all relevant source code into a single text file."""
 
     output_filepath = project_root / output_filename
-    logging.info("Project root identified as: %s", project_root)
-    logging.info("Output will be saved to: %s\n", output_filepath)
+    logger.info("Project root identified as: %s", project_root)
+    logger.info("Output will be saved to: %s\n", output_filepath)
 
-    files_processed_count = 0
-    files_skipped_count = 0
+    counts = {"processed": 0, "skipped": 0}
 
     exclude_files = set(EXCLUDE_FILES)
     exclude_files.add(output_filename)
 
     # First, collect the tree summary for the header.
-    logging.info("Collecting project tree structure...")
+    logger.info("Collecting project tree structure...")
     tree_lines, tree_stats = collect_project_tree_lines(project_root, exclude_files)
 
-    logging.info(
+    logger.info(
         "Found %d files to include in the archive.\n",
         tree_stats["included_files"],
     )
 
     try:
-        with open(output_filepath, "w", encoding="utf-8", errors="replace") as outfile:
-            outfile.write("--- Project Source Code Archive ---\n\n")
-            outfile.write(
+        with open(output_filepath, "wb", buffering=OUTPUT_BUFFER_SIZE) as outfile:
+
+            def _write(text: str) -> None:
+                outfile.write(text.encode("utf-8", errors="replace"))
+
+            header = (
+                "--- Project Source Code Archive ---\n\n"
                 "This file contains the concatenated source code of the project, "
                 "with each file wrapped in tags indicating its relative path.\n\n"
-            )
-
-            # Write tree summary at the beginning.
-            outfile.write("--- Full Project Source Tree ---\n")
-            outfile.write(
+                # Write tree summary at the beginning.
+                "--- Full Project Source Tree ---\n"
                 "Legend: [include] exported in the content section; "
                 "[exclude] not exported in the content section.\n"
-            )
-            outfile.write(
                 "Excluded directories are shown only at the first excluded "
                 "node and their children are not expanded.\n"
-            )
-            outfile.write(
                 f"Included files: {tree_stats['included_files']}\n"
                 f"Excluded files: {tree_stats['excluded_files']}\n"
                 f"Excluded directories (collapsed): "
                 f"{tree_stats['excluded_directories']}\n\n"
             )
-            for line in tree_lines:
-                outfile.write(line + "\n")
-            outfile.write("\n--- End of Tree ---\n\n")
-
-            for dirpath, dirnames, filenames in os.walk(project_root, topdown=True):
-                current_path = Path(dirpath)
-                dirnames[:] = filter_walk_directories(
-                    list(dirnames), current_path, project_root
-                )
+            tree_block = "".join(f"{line}\n" for line in tree_lines)
+            _write(f"{header}{tree_block}\n--- End of Tree ---\n\n")
+
+            def _scan(root_path: str) -> Iterator[Tuple[Path, str]]:
+                # Depth-first over an explicit stack of (dir path, relative
+                # prefix); the root is the only entry with an empty prefix.
+                # Children are pushed in reverse so they pop in sorted order,
+                # giving the same file order as a top-down os.walk.
+                stack: Deque[Tuple[str, str]] = deque([(root_path, "")])
+                while stack:
+                    dir_path, rel_prefix = stack.pop()
+                    # Keep os.walk semantics: unreadable directories are skipped
+                    # silently and symlinked directories are not followed.
+                    try:
+                        with os.scandir(dir_path) as it:
+                            entries = sorted(it, key=attrgetter("name"))
+                    except OSError:
+                        continue
 
-                # --- FILE PROCESSING LOGIC ---
-                for filename in sorted(filenames):
-                    filepath = current_path / filename
-                    relative_path_str = filepath.relative_to(project_root).as_posix()
-                    content: Optional[str] = None
-                    include_in_archive, reason = get_archive_file_status(
-                        filepath, exclude_files
+                    subdirs: List[os.DirEntry] = []
+                    for entry in entries:
+                        if entry.is_dir():
+                            if entry.is_symlink() or get_directory_exclude_reason(
+                                entry.name, not rel_prefix
+                            ):
+                                continue
+                            subdirs.append(entry)
+                            continue
+                        yield Path(entry.path), rel_prefix + entry.name
+
+                    stack.extend(
+                        (entry.path, f"{rel_prefix}{entry.name}/")
+                        for entry in reversed(subdirs)
                     )
 
-                    if not include_in_archive:
-                        logging.info(
+            # Per-file outcomes are DEBUG detail; at INFO one tally line is
+            # logged per directory once the traversal moves past it.
+            log_files = logger.isEnabledFor(logging.DEBUG)
+            current_dir = ""
+            dir_counts = {"processed": 0, "skipped": 0}
+
+            def _flush_dir_summary() -> None:
+                if logger.isEnabledFor(logging.INFO) and any(dir_counts.values()):
+                    logger.info(
+                        "  %s: processed %d, skipped %d",
+                        current_dir or ".",
+                        dir_counts["processed"],
+                        dir_counts["skipped"],
+                    )
+                dir_counts["processed"] = dir_counts["skipped"] = 0
+
+            def _tally(relative_path_str: str, outcome: str) -> None:
+                nonlocal current_dir
+                relative_dir = relative_path_str.rpartition("/")[0]
+                if relative_dir != current_dir:
+                    _flush_dir_summary()
+                    current_dir = relative_dir
+                counts[outcome] += 1
+                dir_counts[outcome] += 1
+
+            def _consume(
+                relative_path_str: str, future: "Future[ArchiveEntry]"
+            ) -> None:
+                try:
+                    include_in_archive, reason, payload = future.result()
+                except Exception as e:
+                    _tally(relative_path_str, "skipped")
+                    logger.error("Could not read file %s: %s", relative_path_str, e)
+                    return
+
+                if not include_in_archive:
+                    if log_files:
+                        logger.debug(
                             "  - Skipping excluded file: %s (%s)",
                             relative_path_str,
                             reason,
                         )
-                        files_skipped_count += 1
-                        continue
-
-                    try:
-                        # Step 1: Specifically handle Jupyter Notebooks.
-                        if filepath.suffix.lower() == ".ipynb":
-                            logging.info(
-                                "  + Processing Notebook: %s", relative_path_str
-                            )
-                            content = process_notebook(filepath)
-                        # Step 2: Handle general text files.
-                        elif is_likely_text_file(filepath):
-                            logging.info(
-                                "  + Processing Text File: %s", relative_path_str
-                            )
-                            with open(
-                                filepath, "r", encoding="utf-8", errors="replace"
-                            ) as infile:
-                                content = infile.read()
-                        # Step 3: The inclusion classifier should have filtered
-                        # everything else already, but keep a safe fallback.
-                        else:
-                            logging.info(
-                                "  - Skipping binary/excluded file: %s",
-                                relative_path_str,
-                            )
-                            files_skipped_count += 1
-                            continue
-
-                        # Write content to the output file if it's not empty.
-                        if content and content.strip():
-                            outfile.write(f"<{relative_path_str}>\n")
-                            outfile.write(content.strip())
-                            outfile.write(f"\n</{relative_path_str}>\n\n")
-                            files_processed_count += 1
-                        else:
-                            files_skipped_count += 1
-                            logging.info(
-                                "    No content extracted from %s", relative_path_str
-                            )
-
-                    except Exception as e:
-                        files_skipped_count += 1
-                        logging.error(
-                            "Could not read file %s: %s", relative_path_str, e
+                    _tally(relative_path_str, "skipped")
+                    return
+
+                if payload:
+                    outfile.write(payload)
+                    _tally(relative_path_str, "processed")
+                    if log_files:
+                        logger.debug(
+                            "  + Processed %s: %s",
+                            "Notebook"
+                            if _lower_suffix(relative_path_str) == ".ipynb"
+                            else "Text File",
+                            relative_path_str,
+                        )
+                else:
+                    _tally(relative_path_str, "skipped")
+                    if log_files:
+                        logger.debug(
+                            "    No content extracted from %s", relative_path_str
                         )
 
-        logging.info("\n--- Summary ---")
-        logging.info("Successfully processed %d files.", files_processed_count)
-        logging.info(
-            "Skipped %d binary, excluded, or unreadable files.", files_skipped_count
+            # --- FILE PROCESSING LOGIC ---
+            # Files are read on the pool but written strictly in traversal
+            # order; the bounded window caps how many payloads sit in memory.
+            pending: Deque[Tuple[str, "Future[ArchiveEntry]"]] = deque()
+            with ThreadPoolExecutor(max_workers=MAX_READ_WORKERS) as executor:
+                for filepath, relative_path_str in _scan(os.fspath(project_root)):
+                    future = executor.submit(
+                        render_archive_entry, filepath, relative_path_str, exclude_files
+                    )
+                    pending.append((relative_path_str, future))
+                    if len(pending) >= MAX_PENDING_FILES:
+                        _consume(*pending.popleft())
+                while pending:
+                    _consume(*pending.popleft())
+            _flush_dir_summary()
+
+        logger.info("\n--- Summary ---")
+        logger.info("Successfully processed %d files.", counts["processed"])
+        logger.info(
+            "Skipped %d binary, excluded, or unreadable files.", counts["skipped"]
         )
-        logging.info("Combined output saved to: %s", output_filepath)
+        logger.info("Combined output saved to: %s", output_filepath)
 
     except IOError as e:
-        logging.error("Could not write to output file %s: %s", output_filepath, e)
+        logger.error("Could not write to output file %s: %s", output_filepath, e)
     except Exception as e:
-        logging.error("An unexpected error occurred: %s", e)
+        logger.error("An unexpected error occurred: %s", e)
 
 
 def main() -> None:
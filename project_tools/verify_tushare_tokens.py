@@ -1,21 +1,29 @@
 # -*- coding: utf-8 -*-
 """Utility script to verify TuShare tokens via the user quota endpoint."""
+import functools
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable, Literal, TypedDict
+from typing import Any, Callable, Iterable, Literal, Sequence, TypedDict
 
 import tushare as ts
 
 
 ENV_KEYS = ("TUSHARE_TOKEN", "TUSHARE_TOKEN_2")
 
+# ``KEY=value`` assignments in a .env file; comments and blank lines never match.
+_ENV_LINE_RE = re.compile(
+    r"^[^\S\n]*([A-Za-z_][A-Za-z0-9_]*)[^\S\n]*=[^\S\n]*(.*?)[^\S\n]*$", re.M
+)
+
 
 class TokenInfo(TypedDict):
     """Structured token metadata for a successful check."""
 
     env_key: str
     user_id: str
-    rows: str
+    rows: Callable[[], str]
     has_rows: bool
 
 
@@ -39,39 +47,41 @@ TokenCheckResult = TokenCheckSuccess | TokenCheckFailure
 def _env_paths_to_try() -> Iterable[Path]:
     """Yield plausible locations of a .env file for convenience."""
     script_dir = Path(__file__).resolve().parent
-    # Start with CWD (useful when running via poetry/pytest), then walk up from script dir
-    yield Path.cwd() / ".env"
-    for parent in [script_dir, *script_dir.parents]:
-        yield parent / ".env"
+    # Start with CWD (useful when running via poetry/pytest), then walk up from script dir.
+    # CWD is often the script dir or one of its parents; skip directories already tried.
+    seen: set[Path] = set()
+    for directory in (Path.cwd(), script_dir, *script_dir.parents):
+        if directory in seen:
+            continue
+        seen.add(directory)
+        yield directory / ".env"
 
 
 def load_local_env() -> None:
     """Populate environment variables from the first existing .env file."""
-    for env_path in _env_paths_to_try():
-        if not env_path.exists():
-            continue
+    env_path = next((path for path in _env_paths_to_try() if path.exists()), None)
+    if env_path is None:
+        return
+
+    for key, value in _ENV_LINE_RE.findall(env_path.read_text(encoding="utf-8")):
+        os.environ.setdefault(key, value.strip('"').strip("'"))
 
-        for raw_line in env_path.read_text(encoding="utf-8").splitlines():
-            line = raw_line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
 
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            os.environ.setdefault(key, value)
-        break
+def _query_user(token: str) -> Any:
+    """Call the TuShare user quota endpoint for ``token``."""
+    return ts.pro_api(token=token).user(token=token)
 
 
-def check_token(env_key: str) -> TokenCheckResult:
+def check_token(
+    env_key: str, query: Callable[[str], Any] = _query_user
+) -> TokenCheckResult:
     """Return the outcome of verifying the TuShare token stored under ``env_key``."""
     token = os.getenv(env_key)
     if not token:
         return {"env_key": env_key, "ok": False, "message": f"环境变量 {env_key} 未设置。"}
 
     try:
-        pro = ts.pro_api(token=token)
-        df = pro.user(token=token)
+        df = query(token)
     except Exception as exc:  # pylint: disable=broad-except
         return {
             "env_key": env_key,
@@ -82,20 +92,37 @@ def check_token(env_key: str) -> TokenCheckResult:
     if df is None:
         return {"env_key": env_key, "ok": False, "message": f"TuShare 返回空对象，无法验证 {env_key}。"}
 
-    # ``pro.user`` returns multiple rows when several quotas are expiring; serialize for readability.
+    has_rows = len(df.index) > 0
+    # ``pro.user`` returns multiple rows when several quotas are expiring; the JSON
+    # serialization is deferred until the rows are actually printed.
     return {
         "env_key": env_key,
-        "user_id": str(df.iloc[0]["user_id"]) if not df.empty else "<未知>",
-        "rows": df.to_json(orient="records", force_ascii=False),
-        "has_rows": not df.empty,
+        "user_id": str(df.iloc[0]["user_id"]) if has_rows else "<未知>",
+        "rows": functools.partial(df.to_json, orient="records", force_ascii=False),
+        "has_rows": has_rows,
         "ok": True,
     }
 
 
+def check_tokens(env_keys: Sequence[str]) -> list[TokenCheckResult]:
+    """Check ``env_keys`` in order, querying TuShare once per distinct token.
+
+    The queries run concurrently; keys holding the same token share one query.
+    """
+    tokens = {token for token in map(os.getenv, env_keys) if token}
+    with ThreadPoolExecutor(max_workers=max(len(tokens), 1)) as executor:
+        queries = {token: executor.submit(_query_user, token) for token in tokens}
+        return [
+            check_token(env_key, lambda token: queries[token].result())
+            for env_key in env_keys
+        ]
+
+
 def main() -> None:
     load_local_env()
 
-    results = [check_token(env_key) for env_key in ENV_KEYS]
+    results = check_tokens(ENV_KEYS)
+
     any_success = False
 
     for result in results:
@@ -105,7 +132,7 @@ def main() -> None:
             any_success = True
             print(f"用户 ID: {result['user_id']}")
             if result["has_rows"] is True:
-                print(f"积分明细: {result['rows']}")
+                print(f"积分明细: {result['rows']()}")
             else:
                 print("积分明细: [] (未返回即将到期的积分记录)")
         else:
@@ -0,0 +1,148 @@
+"""Regression checks for export_repo_source."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from typing import List, Optional, Tuple
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "project_tools"))
+
+import export_repo_source  # noqa: E402
+
+
+def _large_notebook_bytes(markdown_source: bytes) -> bytes:
+    """Builds a notebook above NOTEBOOK_STREAM_THRESHOLD with NaN in an output."""
+    padding = "x" * (export_repo_source.NOTEBOOK_STREAM_THRESHOLD + 1024)
+    code_cell = json.dumps(
+        {
+            "cell_type": "code",
+            "source": ["import math\n", "math.nan"],
+            "outputs": [{"data": {"text/plain": padding}, "value": float("nan")}],
+        }
+    ).encode("utf-8")
+    assert b"NaN" in code_cell
+    markdown_cell = b'{"cell_type": "markdown", "source": "' + markdown_source + b'"}'
+    return b'{"cells": [' + code_cell + b", " + markdown_cell + b'], "nbformat": 4}'
+
+
+class StreamTextFileTest(unittest.TestCase):
+    """stream_text_file must match ``open(..., errors="replace").read().strip()``."""
+
+    def _stream(
+        self, data: bytes, chunk_size: int
+    ) -> Tuple[Optional[bool], str, str]:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "f.txt"
+            path.write_bytes(data)
+            parts: List[str] = []
+            with mock.patch.object(
+                export_repo_source, "READ_CHUNK_SIZE", chunk_size
+            ):
+                written = export_repo_source.stream_text_file(
+                    path, "f.txt", parts.append
+                )
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                expected = f.read().strip()
+        return written, "".join(parts), expected
+
+    def assertStreamsLikeReadStrip(self, data: bytes) -> None:
+        for chunk_size in (1, 2, 3, 5, 64):
+            with self.subTest(chunk_size=chunk_size):
+                written, output, expected = self._stream(data, chunk_size)
+                self.assertEqual(written, bool(expected))
+                if expected:
+                    self.assertEqual(output, f"<f.txt>\n{expected}\n</f.txt>\n\n")
+                else:
+                    self.assertEqual(output, "")
+
+    def test_leading_and_trailing_blank_runs_are_stripped(self) -> None:
+        self.assertStreamsLikeReadStrip(
+            b"\n\n  \t\nfirst\n\n  middle  \n\n\n \t\n"
+        )
+
+    def test_crlf_split_across_chunk_boundary(self) -> None:
+        # With chunk sizes 1-3 the CR and LF land in different chunks.
+        self.assertStreamsLikeReadStrip(b"ab\r\ncd\r\n\r\nef\r\n")
+
+    def test_lone_cr_at_chunk_boundary(self) -> None:
+        self.assertStreamsLikeReadStrip(b"a\rb\r\r")
+
+    def test_invalid_utf8_is_replaced(self) -> None:
+        self.assertStreamsLikeReadStrip(b"caf\xc3 \xff\n\xe4\xb8\xad\xe6\n")
+
+    def test_multibyte_whitespace_at_edges(self) -> None:
+        self.assertStreamsLikeReadStrip("\u3000 text\u3000\n\u3000".encode("utf-8"))
+
+    def test_whitespace_only_file_is_not_written(self) -> None:
+        written, output, _ = self._stream(b" \r\n\t\n  \n", 2)
+        self.assertIs(written, False)
+        self.assertEqual(output, "")
+
+    def test_empty_file_is_not_written(self) -> None:
+        written, output, _ = self._stream(b"", 2)
+        self.assertIs(written, False)
+        self.assertEqual(output, "")
+
+    def test_nul_in_first_chunk_is_binary(self) -> None:
+        written, output, _ = self._stream(b"x\0y", 64)
+        self.assertIsNone(written)
+        self.assertEqual(output, "")
+
+
+class ProcessNotebookTest(unittest.TestCase):
+    def _process(self, data: bytes) -> str:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "large.ipynb"
+            path.write_bytes(data)
+            content = export_repo_source.process_notebook(path)
+        self.assertIsNotNone(content)
+        return content
+
+    def test_large_notebook_with_nan_output_keeps_cells(self) -> None:
+        content = self._process(_large_notebook_bytes(b"# Title"))
+        self.assertEqual(
+            content,
+            "# --- Code Cell 1 ---\nimport math\nmath.nan\n\n"
+            "# --- Markdown Cell 2 ---\n# Title\n",
+        )
+
+    def test_large_notebook_with_invalid_utf8_keeps_cells(self) -> None:
+        content = self._process(_large_notebook_bytes(b"caf\xff"))
+        self.assertIn("# --- Markdown Cell 2 ---\ncaf�\n", content)
+
+
+class RenderArchiveEntryTest(unittest.TestCase):
+    def _render(self, name: str, data: bytes) -> export_repo_source.ArchiveEntry:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / name
+            path.write_bytes(data)
+            return export_repo_source.render_archive_entry(path, name, set())
+
+    def test_allowlisted_extension_with_nul_bytes_is_skipped(self) -> None:
+        self.assertEqual(
+            self._render("nul.ts", b"x\0y"),
+            (False, "binary or unreadable file", b""),
+        )
+
+    def test_notebook_dispatch_does_not_depend_on_reason_text(self) -> None:
+        notebook = b'{"cells": [{"cell_type": "code", "source": "x = 1"}]}'
+        with mock.patch.object(
+            export_repo_source,
+            "get_archive_file_status",
+            return_value=(True, "reworded reason"),
+        ):
+            _, _, payload = self._render("nb.ipynb", notebook)
+        self.assertEqual(
+            payload, b"<nb.ipynb>\n# --- Code Cell 1 ---\nx = 1\n</nb.ipynb>\n\n"
+        )
+
+    def test_utf16_text_file_is_skipped(self) -> None:
+        include_in_archive, _, _ = self._render("u16.txt", "hi".encode("utf-16"))
+        self.assertFalse(include_in_archive)
+
+
+if __name__ == "__main__":
+    unittest.main()